@@ -3,27 +3,35 @@
 mcp_cli.pyを使ってdatabase_server.pyをテスト
 """
 
-import subprocess
+import asyncio
 import sys
 
-def run_command(cmd, description):
-    """コマンドを実行して結果を表示"""
-    print(f"\n{'='*60}")
-    print(f"テスト: {description}")
-    print(f"コマンド: {cmd}")
-    print(f"{'='*60}")
-    
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-    print(result.stdout)
-    if result.stderr:
-        print("エラー:", result.stderr)
-    
-    return result.returncode == 0
-
-def main():
+async def run_command(cmd, description):
+    """コマンドを実行して結果をバッファとして返す"""
+    proc = await asyncio.create_subprocess_shell(
+        cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await proc.communicate()
+
+    # 出力順を保つため、表示はバッファにまとめて呼び出し元で出力する
+    lines = [
+        f"\n{'='*60}",
+        f"テスト: {description}",
+        f"コマンド: {cmd}",
+        f"{'='*60}",
+        stdout.decode(errors='replace')
+    ]
+    if stderr:
+        lines.append(f"エラー: {stderr.decode(errors='replace')}")
+
+    return proc.returncode == 0, "\n".join(lines)
+
+async def main():
     print("database_server.py CLIテスト")
     print("修正版：絶対パスでDBファイルを参照")
-    
+
     tests = [
         (
             'uv run python mcp_cli.py --server C:\\MCP_Learning\\chapter06\\database_server.py --list',
@@ -38,18 +46,24 @@ def main():
             "ルートディレクトリから実行"
         ),
     ]
-    
+
+    # 各テストは独立しているため並列実行（uv起動とMCPハンドシェイクの待ち時間を重ねる）
+    results = await asyncio.gather(
+        *(run_command(cmd, desc) for cmd, desc in tests)
+    )
+
     success_count = 0
-    for cmd, desc in tests:
-        if run_command(cmd, desc):
+    for success, output in results:
+        print(output)
+        if success:
             success_count += 1
             print("[OK] 成功")
         else:
             print("[FAIL] 失敗")
-    
+
     print(f"\n{'='*60}")
     print(f"結果: {success_count}/{len(tests)} テスト成功")
-    
+
     if success_count == len(tests):
         print("[成功] すべてのテストが成功しました！")
         print("database_server.pyは任意のディレクトリから正常に動作します。")
@@ -57,4 +71,4 @@ def main():
         print("[警告] 一部のテストが失敗しました。")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
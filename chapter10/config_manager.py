@@ -46,6 +46,8 @@ class LLMConfig:
     force_json: bool = True
     reasoning_effort: str = "minimal"
     max_completion_tokens: int = 5000
+    plan_cache: bool = False
+    plan_cache_ttl: int = 86400
 
 
 @dataclass
@@ -131,7 +133,23 @@ class ConfigManager:
             raise ValueError(f"設定ファイルの解析エラー: {e}")
         except Exception as e:
             raise ValueError(f"設定ファイル読み込みエラー: {e}")
-    
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> Config:
+        """
+        メモリ上の辞書から設定オブジェクトを作成
+
+        テストなどでファイル書き込み・再読み込みを経由せずに
+        設定を渡したい場合に使用する
+
+        Args:
+            data: 設定内容の辞書（config.yamlと同じ構造）
+
+        Returns:
+            Config: 型安全な設定オブジェクト
+        """
+        return ConfigManager._create_config_from_dict(data or {})
+
     @staticmethod
     def _create_config_from_dict(data: Dict[str, Any]) -> Config:
         """辞書からConfigオブジェクトを作成"""
@@ -172,7 +190,9 @@ class ConfigManager:
                 temperature=llm_data.get("temperature", 0.2),
                 force_json=llm_data.get("force_json", True),
                 reasoning_effort=llm_data.get("reasoning_effort", "minimal"),
-                max_completion_tokens=llm_data.get("max_completion_tokens", 5000)
+                max_completion_tokens=llm_data.get("max_completion_tokens", 5000),
+                plan_cache=llm_data.get("plan_cache", False),
+                plan_cache_ttl=llm_data.get("plan_cache_ttl", 86400)
             )
         
         # Conversation設定
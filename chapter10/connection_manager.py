@@ -13,7 +13,9 @@ import asyncio
 import json
 import os
 import sys
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from dotenv import load_dotenv
 from fastmcp import Client
 from fastmcp.client.transports import StdioTransport
@@ -25,6 +27,30 @@ setup_windows_encoding()
 
 load_dotenv()
 
+
+@dataclass(frozen=True, slots=True)
+class ServerConfig:
+    """MCPサーバー1台分の設定
+
+    dict-of-dictより軽量（slotsで__dict__を持たない）で、
+    frozenにより読み込み後の書き換えミスも防げる。
+    """
+    name: str
+    path: Tuple[str, ...]  # [コマンド, 引数...]
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime: float) -> Dict:
+    """設定ファイルをパースして返す（パスと更新時刻をキーにキャッシュ）
+
+    複数インスタンス生成時（特にテスト）に同じJSONを何度も
+    パースしないための共有キャッシュ。ファイルが更新されると
+    mtimeが変わるため自動的に読み直される。
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 class ConnectionManager:
     """
     MCPサーバーへの接続を管理するシンプルなマネージャー（V3版）
@@ -43,33 +69,37 @@ class ConnectionManager:
         self.logger = Logger(verbose=verbose)
         
         # 接続管理用のデータ構造
-        self.servers: Dict[str, Dict] = {}      # サーバー設定情報
+        self.servers: Dict[str, ServerConfig] = {}  # サーバー設定情報
         self.clients: Dict[str, Client] = {}    # 接続済みクライアント
         self.tools_info: Dict[str, Dict] = {}   # ツール名 -> {server, schema}
-        
+
+        # LLM向けツール一覧の整形結果（初期化後は不変なので1回だけ作る）
+        self._tools_for_llm: Optional[str] = None
+
         self._initialized = False
         self._load_config()
     
     def _load_config(self):
         """設定ファイルを読み込み（mcpServers形式対応）"""
-        if not os.path.exists(self.config_file):
+        try:
+            mtime = os.path.getmtime(self.config_file)
+        except OSError:
             raise FileNotFoundError(f"設定ファイルが見つかりません: {self.config_file}")
-        
-        with open(self.config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
+
+        config = _load_config_cached(self.config_file, mtime)
+
         # mcpServers形式から変換
         if "mcpServers" in config:
             for server_name, server_config in config["mcpServers"].items():
-                path = [server_config["command"]] + server_config["args"]
-                self.servers[server_name] = {
-                    "name": server_name,
-                    "path": path
-                }
+                path = (server_config["command"], *server_config["args"])
+                self.servers[server_name] = ServerConfig(name=server_name, path=path)
         else:
             # 従来形式のサポート
             for server_info in config.get("servers", []):
-                self.servers[server_info["name"]] = server_info
+                self.servers[server_info["name"]] = ServerConfig(
+                    name=server_info["name"],
+                    path=tuple(server_info["path"])
+                )
     
     async def initialize(self):
         """全サーバーに接続してツール情報を収集"""
@@ -96,26 +126,33 @@ class ConnectionManager:
         self.logger.ulog("=" * 50, "info")
     
     async def _connect_all_servers(self):
-        """全サーバーに接続"""
+        """全サーバーに接続（ハンドシェイクはI/O待ちなので並行実行）"""
         self.logger.ulog("\nMCPサーバーに接続中...", "info:connection")
-        
-        for server_name, server_info in self.servers.items():
-            try:
-                self.logger.ulog(f"  {server_name}に接続中...", "info:connection")
-                
-                # StdioTransportを使用してクライアントを作成
-                command = server_info["path"][0]
-                args = server_info["path"][1:]
-                transport = StdioTransport(command=command, args=args)
-                client = Client(transport)
-                await client.__aenter__()
-                self.clients[server_name] = client
-                
-                self.logger.ulog(" OK", "info:connection")
-                    
-            except Exception as e:
-                self.logger.ulog(f" 失敗: {e}", "error:error")
-                continue
+
+        # 接続処理は互いに独立なのでgatherで同時に張る
+        # （サーバー数に比例していた起動待ちがほぼ最遅の1台分になる）
+        results = await asyncio.gather(
+            *(self._connect_one(server_info)
+              for server_info in self.servers.values()),
+            return_exceptions=True
+        )
+
+        for server_name, result in zip(self.servers.keys(), results):
+            if isinstance(result, BaseException):
+                self.logger.ulog(f"  {server_name} 失敗: {result}", "error:error")
+            else:
+                self.clients[server_name] = result
+                self.logger.ulog(f"  {server_name} OK", "info:connection")
+
+    async def _connect_one(self, server_info: ServerConfig) -> Client:
+        """1サーバーへ接続してクライアントを返す"""
+        # StdioTransportを使用してクライアントを作成
+        command = server_info.path[0]
+        args = list(server_info.path[1:])
+        transport = StdioTransport(command=command, args=args)
+        client = Client(transport)
+        await client.__aenter__()
+        return client
     
     async def _collect_tools_info(self):
         """接続済みサーバーからツール情報を収集（簡素版）"""
@@ -211,7 +248,14 @@ class ConnectionManager:
                 if info["server"] == server_name]
     
     def format_tools_for_llm(self) -> str:
-        """LLM用にツール情報をフォーマット"""
+        """LLM用にツール情報をフォーマット
+
+        スキーマはinitialize()以降変化しないため、整形は初回のみ行い
+        以降はキャッシュ済み文字列を返す（リクエストごとに呼ばれる）
+        """
+        if self._tools_for_llm is not None:
+            return self._tools_for_llm
+
         formatted = []
         
         for tool_name, info in self.tools_info.items():
@@ -239,8 +283,9 @@ class ConnectionManager:
   パラメータ:
 {params_text}
 """.strip())
-        
-        return "\n\n".join(formatted)
+
+        self._tools_for_llm = "\n\n".join(formatted)
+        return self._tools_for_llm
     
     async def close(self):
         """全ての接続を閉じる"""
@@ -252,4 +297,5 @@ class ConnectionManager:
                     self.logger.ulog(f"{server_name}の切断エラー: {e}", "warning:warning")
         
         self.clients.clear()
+        self._tools_for_llm = None
         self._initialized = False
\ No newline at end of file
@@ -10,10 +10,12 @@ Conversation Manager for MCP Agent
 - LLM向けの文脈フォーマット
 """
 
+from collections import deque
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from state_manager import StateManager
 from config_manager import Config
+from utils import truncate_str
 
 
 class ConversationManager:
@@ -32,7 +34,14 @@ class ConversationManager:
         """
         self.state_manager = state_manager
         self.config = config
-        self.conversation_history: List[Dict] = []
+        # maxlen付きdequeで履歴上限を自動管理（溢れた分は追加時にO(1)で破棄）
+        self.conversation_history: deque = deque(
+            maxlen=config.conversation.max_history
+        )
+        # get_recent_context()の整形結果キャッシュ。
+        # StateManagerの世代番号（_context_version）が進んだら全クリアする
+        self._context_cache: Dict[tuple, str] = {}
+        self._context_cache_version: int = -1
     
     def add_to_conversation(self, role: str, message: str, 
                            execution_results: Optional[List[Dict]] = None) -> None:
@@ -54,12 +63,8 @@ class ConversationManager:
         if execution_results:
             history_item["execution_results"] = execution_results
         
+        # maxlen到達時は最古のエントリがdequeにより自動で押し出される
         self.conversation_history.append(history_item)
-        
-        # 履歴の長さ制限
-        max_history = self.config.conversation.max_history
-        if len(self.conversation_history) > max_history:
-            self.conversation_history = self.conversation_history[-max_history:]
     
     def get_recent_context(self, max_items: Optional[int] = None, 
                           include_results: bool = True,
@@ -77,19 +82,36 @@ class ConversationManager:
         """
         if max_items is None:
             max_items = self.config.conversation.context_limit
-        
+
+        # 1リクエスト中に同じ引数で複数回呼ばれるため、履歴が変わらない限り
+        # 整形済み文字列を使い回す（世代番号が進んでいたらキャッシュを破棄）
+        version = getattr(self.state_manager, "_context_version", None)
+        cache_key = (max_items, include_results, recent_tasks_only)
+        if isinstance(version, int):
+            if version != self._context_cache_version:
+                self._context_cache.clear()
+                self._context_cache_version = version
+            cached = self._context_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         # StateManagerから会話履歴を取得
         conversation_context = self.state_manager.get_conversation_context(max_items)
         
         if not conversation_context:
+            if isinstance(version, int):
+                self._context_cache[cache_key] = ""
             return ""
-        
+
         lines = []
         
         # 会話履歴をフォーマット
+        # 注意: 必ず「ウィンドウ内の最古→最新」の順で並べること。
+        # 連続ターン間でプロンプト先頭部分が一致し続けるため、
+        # LLMプロバイダ側のプレフィックスキャッシュが効く
         for entry in conversation_context:
             role = "User" if entry['role'] == "user" else "Assistant"
-            msg = entry['content'][:150] + "..." if len(entry['content']) > 150 else entry['content']
+            msg = truncate_str(entry['content'], 150)
             timestamp = entry.get('timestamp', '')
             
             if timestamp:
@@ -101,8 +123,11 @@ class ConversationManager:
         # 実行結果を含める場合
         if include_results:
             lines.extend(self._format_execution_results(recent_tasks_only))
-        
-        return "\n".join(lines)
+
+        result = "\n".join(lines)
+        if isinstance(version, int):
+            self._context_cache[cache_key] = result
+        return result
     
     def _format_execution_results(self, recent_tasks_only: bool) -> List[str]:
         """
@@ -127,7 +152,8 @@ class ConversationManager:
             lines.append("\n## 直近の実行結果:")
             for i, task in enumerate(recent_tasks, 1):
                 if task.result:
-                    result_preview = str(task.result)[:300] + "..." if len(str(task.result)) > 300 else str(task.result)
+                    # str()変換は1回だけ行う（従来は最大3回呼んでいた）
+                    result_preview = truncate_str(task.result, 300)
                     lines.append(f"{i}. {task.tool} - {task.description}")
                     lines.append(f"   結果: {result_preview}")
         
@@ -140,10 +166,17 @@ class ConversationManager:
         Returns:
             会話の統計情報
         """
-        user_messages = sum(1 for item in self.conversation_history if item["role"] == "user")
-        assistant_messages = sum(1 for item in self.conversation_history if item["role"] == "assistant")
-        execution_count = sum(1 for item in self.conversation_history if item.get("execution_results"))
-        
+        # 3種類のカウントを1回の走査でまとめて集計
+        user_messages = assistant_messages = execution_count = 0
+        for item in self.conversation_history:
+            role = item["role"]
+            if role == "user":
+                user_messages += 1
+            elif role == "assistant":
+                assistant_messages += 1
+            if item.get("execution_results"):
+                execution_count += 1
+
         return {
             "total_messages": len(self.conversation_history),
             "user_messages": user_messages,
@@ -64,23 +64,26 @@ class DisplayManager:
         if not tasks:
             return
         
-        print(f"\n{header}")
+        # 行ごとにprintせず、まとめて1回の書き込みで出力する
+        lines = [f"\n{header}"]
         for i, task in enumerate(tasks):
             # ステータス判定を統一
-            status = self._get_task_status(i, current_index, completed, failed, 
+            status = self._get_task_status(i, current_index, completed, failed,
                                            task.get('status', 'pending'))
             icon = self._get_status_icon(status)
             description = task.get('description', task.get('tool', 'Unknown'))
-            
+
             line = f"  {icon} {description}"
-            
+
             # タイミング表示
             if self.show_timing and task.get('duration'):
                 line += f" ({task['duration']:.1f}秒)"
             elif status == 'running':
                 line += " [実行中...]"
-            
-            print(line)
+
+            lines.append(line)
+
+        print("\n".join(lines))
     
     def _get_task_status(self, index: int, current_index: int, completed: List[int] = None, 
                         failed: List[int] = None, default_status: str = 'pending') -> str:
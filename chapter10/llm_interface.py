@@ -4,13 +4,66 @@ LLM通信統一インターフェース
 全クラスのLLM通信を統一管理し、テスタビリティとメンテナンス性を向上
 """
 
+import asyncio
+import hashlib
 import json
 import re
 from typing import Dict, List, Optional, Any
+from weakref import WeakKeyDictionary
 from openai import AsyncOpenAI
 
 from config_manager import Config
 from utils import Logger, safe_str
+from plan_cache import SQLitePlanCache
+
+# orjson（Rust実装）があればLLM応答JSONのパースに使う
+# （orjson.JSONDecodeErrorはjson.JSONDecodeErrorのサブクラスなので
+#  既存のexcept節はそのまま機能する）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# LLM応答からJSONコードブロックを取り出す正規表現（呼び出しごとの
+# キャッシュ参照を避けるためモジュールロード時に1回だけコンパイル）
+_JSON_BLOCK_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+_JSON_OBJECT_BLOCK_RE = re.compile(r'```json\s*(\{.*?\})\s*```', re.DOTALL)
+
+# AsyncOpenAIクライアントはイベントループごとに1つを共有する。
+# 内部のhttpx接続プール（TCP+TLSのkeep-alive）を複数の
+# LLMInterfaceインスタンス間で再利用し、ハンドシェイクを1回に抑える。
+# プロセス全体で1つにしないのは、接続が生成元ループに束縛されるため：
+# ループをまたいで使い回すと閉じたループのプールに当たり
+# "Event loop is closed" で失敗する（モジュールスコープのループを
+# 使うテストスイートで実際に起きる構成）。WeakKeyDictionaryなので
+# ループのGCと一緒にエントリも消える
+_clients_by_loop: "WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = WeakKeyDictionary()
+_fallback_client: Optional[AsyncOpenAI] = None
+
+
+def _get_shared_client() -> AsyncOpenAI:
+    """現在のイベントループ用の共有AsyncOpenAIクライアントを取得（初回のみ生成）"""
+    global _fallback_client
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # ループ外（同期的な構築時など）はプロセス共有の1つを返す
+        if _fallback_client is None:
+            _fallback_client = AsyncOpenAI()
+        return _fallback_client
+
+    client = _clients_by_loop.get(loop)
+    if client is None:
+        client = AsyncOpenAI()
+        _clients_by_loop[loop] = client
+    return client
+
+
+def _json_loads(text: str) -> Any:
+    """LLM応答のJSONをパース（orjsonがあれば高速版を使用）"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
 
 
 class LLMInterface:
@@ -26,8 +79,32 @@ class LLMInterface:
         """
         self.config = config
         self.logger = logger
-        self.client = AsyncOpenAI()
-    
+        # クライアントは固定せず、clientプロパティが呼び出し時点の
+        # イベントループに対応する共有クライアントを返す
+        self._client_override: Optional[AsyncOpenAI] = None
+
+        # タスクリスト生成の永続キャッシュ（設定で有効化した場合のみ）
+        self.plan_cache: Optional[SQLitePlanCache] = None
+        if getattr(config.llm, "plan_cache", False):
+            try:
+                self.plan_cache = SQLitePlanCache(
+                    ttl_seconds=getattr(config.llm, "plan_cache_ttl", 86400)
+                )
+            except Exception as e:
+                self.logger.ulog(f"計画キャッシュ初期化失敗: {e}", "warning:config")
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """現在のイベントループに対応する共有クライアント"""
+        if self._client_override is not None:
+            return self._client_override
+        return _get_shared_client()
+
+    @client.setter
+    def client(self, value: AsyncOpenAI) -> None:
+        """テスト等でクライアントを差し替える場合はこちらが優先される"""
+        self._client_override = value
+
     def _get_llm_params(self, messages: List[Dict], **kwargs) -> Dict[str, Any]:
         """LLM呼び出しパラメータを統一生成"""
         params = {
@@ -35,13 +112,15 @@ class LLMInterface:
             "messages": messages,
             "temperature": kwargs.get("temperature", self.config.llm.temperature),
         }
-        
+
         # GPT-5系モデルのreasoningサポート
         if hasattr(self.config.llm, "reasoning_effort") and "gpt-5" in params["model"]:
             params["reasoning_effort"] = self.config.llm.reasoning_effort
-            
-        # トークン数制限
-        if hasattr(self.config.llm, "max_completion_tokens"):
+
+        # トークン数制限（呼び出し側で個別に上限を指定可能）
+        if kwargs.get("max_completion_tokens"):
+            params["max_completion_tokens"] = kwargs["max_completion_tokens"]
+        elif hasattr(self.config.llm, "max_completion_tokens"):
             params["max_completion_tokens"] = self.config.llm.max_completion_tokens
             
         # JSONレスポンス形式指定
@@ -77,18 +156,11 @@ class LLMInterface:
         Returns:
             実行方式判定結果
         """
-        prompt = f"""あなたはユーザーからの要求を分析し、次のどの実行方式が最適かを判定するAIです。
-
-利用可能ツール一覧:
-{tools_info}
-
-最近の会話履歴:
-{recent_context}
-
-現在のユーザー要求:
-「{user_query}」
-
-この要求に対して最適な処理方式を選択してください。
+        # 静的なルールとセッション中不変のツール一覧をsystemメッセージに先頭配置し、
+        # 毎ターン変わる会話履歴とクエリはuserメッセージに分離する。
+        # 先頭部分が安定するためプロバイダ側のプロンプトキャッシュが効き、
+        # 入力トークン課金とTTFTを削減できる
+        system_prompt = f"""あなたはユーザーからの要求を分析し、次のどの実行方式が最適かを判定するAIです。
 
 判定ルール:
 1. 計算、データベース検索、API呼び出し、ファイル操作などが必要な場合 → TOOL
@@ -105,16 +177,30 @@ class LLMInterface:
 
 - NO_TOOLの場合: "response"フィールドに自然で適切な日本語応答を含める
 - CLARIFICATIONの場合: "clarification"フィールドに質問を含める
-- TOOLの場合: "response"フィールドは省略可能"""
+- TOOLの場合: "response"フィールドは省略可能
+
+利用可能ツール一覧:
+{tools_info}"""
+
+        user_prompt = f"""最近の会話履歴:
+{recent_context}
+
+現在のユーザー要求:
+「{user_query}」
+
+この要求に対して最適な処理方式を選択してください。"""
 
         try:
             content = await self._call_llm(
-                messages=[{"role": "system", "content": prompt}],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
                 response_format={"type": "json_object"},
                 temperature=0.1
             )
             
-            result = json.loads(content)
+            result = _json_loads(content)
             
             # type値の正規化
             if result.get('type') not in ['NO_TOOL', 'CLARIFICATION']:
@@ -141,57 +227,102 @@ class LLMInterface:
         Returns:
             生成されたタスクリスト
         """
-        prompt = f"""あなたは以下のタスクを遂行するAIアシスタントです：
-
-ユーザーリクエスト: {user_query}
-{custom_instructions}
-
-利用可能ツール:
-{tools_info}
+        # 実行方式判定と同様、静的な指示＋ツール一覧をsystemに先頭配置して
+        # プロンプトキャッシュを効かせ、可変部分はuserメッセージに分離する
+        system_prompt = f"""あなたはユーザーリクエストを遂行するためのタスクリストを作成するAIアシスタントです。
 
-会話履歴とコンテキスト:
-{context}
-
-上記のユーザーリクエストを実行するために必要なタスクを順序立ててリストアップしてください。
+ユーザーリクエストを実行するために必要なタスクを順序立ててリストアップしてください。
 各タスクはJSON形式で、以下の要素を含める必要があります：
 - tool: 使用するツール名
 - params: ツールに渡すパラメータ（辞書形式）
 - description: タスクの説明
 
-応答は純粋なJSONリスト形式でお願いします：
-[
+応答はJSON形式でお願いします：
+{{"tasks": [
   {{"tool": "ツール名", "params": {{"param1": "value1"}}, "description": "タスクの説明"}},
   ...
-]"""
+]}}
+
+利用可能ツール:
+{tools_info}"""
+
+        user_prompt = f"""ユーザーリクエスト: {user_query}
+{custom_instructions}
+
+会話履歴とコンテキスト:
+{context}"""
+
+        # キャッシュ確認（temperature=0.0のため同一プロンプトは同一の計画になる）
+        cache_key = None
+        if self.plan_cache:
+            cache_key = hashlib.sha256(
+                f"{self.config.llm.model}:{system_prompt}\n{user_prompt}".encode('utf-8')
+            ).hexdigest()
+            cached_tasks = self.plan_cache.lookup(cache_key)
+            if cached_tasks is not None:
+                self.logger.ulog("キャッシュからタスクリストを取得", "debug:task")
+                return cached_tasks
+
+        # タスクリストJSONは短いので512トークンで十分だが、
+        # reasoning系モデル（gpt-5等）はこの枠を思考トークンが消費して
+        # 本文が空になるため、キャップは非reasoningモデルに限定する。
+        # 設定値が512より小さい場合はそちらを尊重する
+        plan_max_tokens = None
+        if "gpt-5" not in self.config.llm.model:
+            configured = getattr(self.config.llm, "max_completion_tokens", None)
+            plan_max_tokens = min(512, configured) if configured else 512
 
         try:
+            # 計画出力は構造が決まっているため、temperature=0.0で決定的に生成し、
+            # JSONモード指定でマークダウンフェンスを排除（解析の正規表現処理を省略）
             content = await self._call_llm(
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.1
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.0,
+                max_completion_tokens=plan_max_tokens,
+                response_format={"type": "json_object"}
             )
-            
-            # JSONリストとして解析を試行
-            try:
-                tasks = json.loads(content)
-                if isinstance(tasks, list):
-                    return tasks
-            except json.JSONDecodeError:
-                pass
-            
-            # JSONブロック抽出を試行
-            json_match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
-            if json_match:
-                tasks = json.loads(json_match.group(1))
-                if isinstance(tasks, list):
-                    return tasks
-            
+
+            tasks = self._extract_task_list(content)
+            if tasks is not None:
+                if self.plan_cache and cache_key:
+                    self.plan_cache.update(cache_key, tasks)
+                return tasks
+
             # フォールバック: 単一タスクとして処理
             self.logger.ulog(f"タスクリスト解析失敗、フォールバック実行: {content[:100]}...", "warning:task")
             return []
-            
+
         except Exception as e:
             self.logger.ulog(f"タスクリスト生成失敗: {e}", "error:task")
             return []
+
+    def _extract_task_list(self, content: str) -> Optional[List[Dict]]:
+        """LLM応答からタスクリストを抽出（オブジェクト形式・リスト形式の両方に対応）"""
+        try:
+            parsed = _json_loads(content)
+            if isinstance(parsed, dict) and isinstance(parsed.get("tasks"), list):
+                return parsed["tasks"]
+            if isinstance(parsed, list):
+                return parsed
+        except json.JSONDecodeError:
+            pass
+
+        # フォールバック: JSONブロック抽出を試行
+        json_match = _JSON_BLOCK_RE.search(content)
+        if json_match:
+            try:
+                parsed = _json_loads(json_match.group(1))
+                if isinstance(parsed, dict) and isinstance(parsed.get("tasks"), list):
+                    return parsed["tasks"]
+                if isinstance(parsed, list):
+                    return parsed
+            except json.JSONDecodeError:
+                pass
+
+        return None
     
     async def interpret_results(self, user_query: str, results: List[Dict], context: str, custom_instructions: str = "") -> str:
         """
@@ -267,9 +398,9 @@ class LLMInterface:
             )
             
             # JSONブロック抽出
-            json_match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
+            json_match = _JSON_BLOCK_RE.search(content)
             if json_match:
-                result = json.loads(json_match.group(1).strip())
+                result = _json_loads(json_match.group(1).strip())
                 resolved_params = result.get("resolved_params", task_dict.get('params', {}))
                 reasoning = result.get("reasoning", "")
                 
@@ -279,7 +410,7 @@ class LLMInterface:
                 return resolved_params
             else:
                 # JSONブロックがない場合、直接解析を試行
-                result = json.loads(content)
+                result = _json_loads(content)
                 return result.get("resolved_params", task_dict.get('params', {}))
                 
         except (json.JSONDecodeError, KeyError) as e:
@@ -332,9 +463,9 @@ class LLMInterface:
             )
             
             # JSONブロック抽出
-            json_match = re.search(r'```json\s*(\{.*?\})\s*```', content, re.DOTALL)
+            json_match = _JSON_OBJECT_BLOCK_RE.search(content)
             if json_match:
-                result = json.loads(json_match.group(1))
+                result = _json_loads(json_match.group(1))
                 if result.get("修正成功"):
                     self.logger.ulog(f"パラメータを自動修正: {result.get('params')}", "info:correction")
                     return result.get("params")
@@ -382,11 +513,11 @@ JSON形式で回答してください：
                 temperature=0.2
             )
             
-            json_match = re.search(r'```json\s*(.*?)\s*```', content, re.DOTALL)
+            json_match = _JSON_BLOCK_RE.search(content)
             if json_match:
-                return json.loads(json_match.group(1).strip())
+                return _json_loads(json_match.group(1).strip())
             else:
-                return json.loads(content)
+                return _json_loads(content)
                 
         except Exception as e:
             self.logger.ulog(f"回復戦略生成エラー: {e}", "error:recovery")
@@ -409,7 +540,7 @@ JSON形式で回答してください：
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(content)
+            result = _json_loads(content)
             
             # 必要なフィールドのデフォルト値設定
             if "is_success" not in result:
@@ -9,7 +9,7 @@ import os
 import json
 import asyncio
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 
 from connection_manager import ConnectionManager
@@ -17,7 +17,7 @@ from display_manager import DisplayManager
 from error_handler import ErrorHandler
 from prompts import PromptTemplates
 from config_manager import ConfigManager, Config
-from utils import Logger, safe_str
+from utils import Logger, safe_str, truncate_str
 from state_manager import StateManager, TaskState
 from task_manager import TaskManager
 from conversation_manager import ConversationManager
@@ -46,9 +46,20 @@ class MCPAgent:
     - 依存関係の自動解決
     """
     
-    def __init__(self, config_path: str = "config.yaml"):
-        """初期化（メイン処理）"""
-        self.config = ConfigManager.load(config_path)
+    def __init__(self, config_path: Union[str, Dict[str, Any], Config] = "config.yaml"):
+        """
+        初期化（メイン処理）
+
+        Args:
+            config_path: 設定ファイルのパス、設定辞書、またはConfigオブジェクト
+                         （辞書・Configを渡すとファイル読み込みを省略できる）
+        """
+        if isinstance(config_path, Config):
+            self.config = config_path
+        elif isinstance(config_path, dict):
+            self.config = ConfigManager.from_dict(config_path)
+        else:
+            self.config = ConfigManager.load(config_path)
         ConfigManager.validate_config(self.config)
         
         self._initialize_ui_and_logging()  # ログ設定を最初に初期化
@@ -194,11 +205,14 @@ class MCPAgent:
             self.logger.ulog(f"\n{'カスタム指示あり' if self.custom_instructions else '基本能力のみ'}", "info:instruction")
             self.logger.ulog("=" * 60, "info")
         
-        # MCP接続管理を初期化（V3から継承）
-        await self.connection_manager.initialize()
-        
-        # セッション状態を初期化
-        actual_session_id = await self.state_manager.initialize_session(session_id)
+        # MCP接続管理とセッション状態は互いに独立なので並行して初期化する
+        # （MCPサーバーのハンドシェイクとセッションファイルI/Oを重ね合わせる）
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self.connection_manager.initialize())
+            session_task = tg.create_task(
+                self.state_manager.initialize_session(session_id)
+            )
+        actual_session_id = session_task.result()
         
         if self.verbose:
             self.logger.ulog(actual_session_id, "info:session")
@@ -486,38 +500,45 @@ class MCPAgent:
     def _serialize_execution_results(self, results: List[Dict]) -> List[Dict]:
         """実行結果のシリアライズ処理"""
         serializable_results = []
-        
+
+        # ループ内で毎回引かない値はローカル変数に束縛しておく
+        max_length = self.config.result_display.max_result_length
+        show_truncated_info = self.config.result_display.show_truncated_info
+
         for r in results:
+            success = r["success"]
+            task_description = r.get("task_description")
             result_data = {
-                "step": r.get("step", r.get("task_description", "タスク")),
+                "step": r.get("step", task_description or "タスク"),
                 "tool": r.get("tool", r.get("task_tool", "不明")),
-                "success": r["success"],
-                "description": r.get("description", r.get("task_description", "実行完了"))
+                "success": success,
+                "description": r.get("description", task_description or "実行完了")
             }
-            
-            if r["success"]:
+
+            if success:
                 # 成功時は結果を含める
-                max_length = self.config.result_display.max_result_length
                 result_str = str(r["result"])
-                
+
                 if len(result_str) <= max_length:
                     result_data["result"] = result_str
                 else:
                     # 長すぎる場合は省略情報を追加
                     result_data["result"] = result_str[:max_length]
-                    if self.config.result_display.show_truncated_info:
+                    if show_truncated_info:
                         result_data["result"] += f"\n[注記: 結果が長いため{max_length}文字で省略。実際の結果はより多くのデータを含む可能性があります]"
             else:
                 result_data["error"] = r["error"]
             
             serializable_results.append(result_data)
         
-        # デバッグ: LLMに渡されるデータを確認
-        self.logger.ulog("Serializable results being sent to LLM:", "debug", show_level=True)
-        for i, result in enumerate(serializable_results):
-            result_preview = str(result.get("result", "N/A"))[:100] + "..." if len(str(result.get("result", "N/A"))) > 100 else str(result.get("result", "N/A"))
-            self.logger.ulog(f"[{i+1}] Tool: {result['tool']}, Result: {result_preview}", "debug", show_level=True)
-        
+        # デバッグ: LLMに渡されるデータを確認（DEBUGレベル時のみ文字列化する）
+        if self.logger.should_log("debug"):
+            self.logger.ulog("Serializable results being sent to LLM:", "debug", show_level=True)
+            for i, result in enumerate(serializable_results):
+                result_str = str(result.get("result", "N/A"))
+                result_preview = truncate_str(result_str, 100)
+                self.logger.ulog(f"[{i+1}] Tool: {result['tool']}, Result: {result_preview}", "debug", show_level=True)
+
         return serializable_results
     
     async def _generate_interpretation_response(self, user_query: str, serializable_results: List[Dict]) -> str:
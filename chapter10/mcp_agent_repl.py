@@ -24,6 +24,13 @@ try:
 except ImportError:
     PROMPT_TOOLKIT_AVAILABLE = False
 
+# uvloop support（Linux/macOSで入っていればイベントループを高速化）
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 
 def create_prompt_session(agent):
     """シンプルなプロンプトセッション作成（補完・履歴機能付き、ESCバインドなし）"""
@@ -181,4 +188,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Plan Cache for MCP Agent
+タスクリスト生成結果のSQLite永続キャッシュ
+
+temperature=0.0の計画生成は同一プロンプトに対して決定的なため、
+プロセスをまたいで結果を再利用できる。1回のディスク参照で
+LLM往復（約1秒）を置き換える。
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class SQLitePlanCache:
+    """
+    タスクリストのSQLite永続キャッシュ
+
+    キー（プロンプトのハッシュ等）→ タスクリストJSON を保存し、
+    CI実行やローカル開発の繰り返しでウォームスタートを可能にする
+    """
+
+    def __init__(self, path: str = ".mcp_agent/plan_cache.sqlite", ttl_seconds: int = 86400):
+        """
+        Args:
+            path: キャッシュDBファイルのパス
+            ttl_seconds: エントリの有効期間（秒）。0以下で無期限
+        """
+        self.ttl_seconds = ttl_seconds
+        # StateManagerより先に構築されるため、.mcp_agent/が
+        # まだ存在しないフレッシュな作業ディレクトリでも動くようにする
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.con = sqlite3.connect(path, check_same_thread=False)
+        self.con.execute(
+            "CREATE TABLE IF NOT EXISTS plans("
+            "key TEXT PRIMARY KEY, plan_json TEXT, created REAL)"
+        )
+        self.con.commit()
+
+    def lookup(self, key: str) -> Optional[List[Dict]]:
+        """キーに対応するタスクリストを取得（期限切れ・未登録・DB異常はNone）
+
+        キャッシュはあくまで高速化のための層なので、DBのロックや破損
+        （同一ディレクトリで複数エージェントが共有するケース）では
+        例外を上げず、呼び出し側が通常のLLM生成へフォールバックできるようにする
+        """
+        try:
+            row = self.con.execute(
+                "SELECT plan_json, created FROM plans WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            plan_json, created = row
+            if self.ttl_seconds > 0 and time.time() - created > self.ttl_seconds:
+                self.con.execute("DELETE FROM plans WHERE key = ?", (key,))
+                self.con.commit()
+                return None
+
+            return json.loads(plan_json)
+        except (sqlite3.Error, json.JSONDecodeError):
+            return None
+
+    def update(self, key: str, tasks: List[Dict]) -> None:
+        """タスクリストをキャッシュに保存（DB異常時は何もしない）"""
+        try:
+            self.con.execute(
+                "INSERT OR REPLACE INTO plans(key, plan_json, created) VALUES (?, ?, ?)",
+                (key, json.dumps(tasks, ensure_ascii=False), time.time())
+            )
+            self.con.commit()
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """DB接続を閉じる"""
+        try:
+            self.con.close()
+        except sqlite3.Error:
+            pass
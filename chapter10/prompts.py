@@ -26,12 +26,12 @@ class PromptTemplates:
     ) -> str:
         """
         CLARIFICATION対応の実行方式判定用プロンプトを生成
-        
+
         Args:
             recent_context: 最近の会話文脈
             user_query: ユーザーの要求
             tools_info: 利用可能なツール情報
-            
+
         Returns:
             実行方式判定用プロンプト（CLARIFICATION対応版）
         """
@@ -231,7 +231,7 @@ class ReplCommandHandlers:
             
             # 統計
             total_tasks = len(pending_tasks) + len(completed_tasks)
-            clarifications = len([t for t in pending_tasks if t.tool == "CLARIFICATION"])
+            clarifications = sum(1 for t in pending_tasks if t.tool == "CLARIFICATION")
             
             lines.extend([
                 "📊 統計:",
@@ -10,6 +10,7 @@ State Manager for MCP Agent V6
 - セッション復元機能
 """
 
+import asyncio
 import os
 import json
 from datetime import datetime
@@ -18,10 +19,21 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from utils import safe_str
 
+# orjson（Rust実装）があれば会話履歴のシリアライズに使う
+# 標準jsonの数倍速く、UTF-8の日本語文字列をそのまま出力できる
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+@dataclass(slots=True)
 class TaskState:
-    """タスクの状態を表すクラス"""
+    """タスクの状態を表すクラス
+
+    長いセッションでは大量に保持されるため、slotsで__dict__を
+    持たせず1インスタンスあたりのメモリを抑える
+    """
     task_id: str
     tool: str
     params: Dict[str, Any]
@@ -80,8 +92,29 @@ class StateManager:
         
         # ディレクトリ構造を初期化
         self._ensure_directory_structure()
-        
+
         self.current_session: Optional[SessionState] = None
+
+        # task_id -> TaskState のインデックス（pending_tasksの線形探索を回避）
+        self._pending_index: Dict[str, TaskState] = {}
+
+        # セッション内容の世代番号。_save_session（全ミューテータの共通経路）で
+        # インクリメントし、ConversationManagerの文脈キャッシュ無効化に使う
+        self._context_version: int = 0
+
+        # session.jsonの書き込みを直列化するロック。
+        # バックグラウンドタスク化された保存（会話エントリ追加など）と
+        # 次リクエストの保存が同じファイルを同時に開くのを防ぐ
+        self._save_lock = asyncio.Lock()
+
+    def _rebuild_pending_index(self):
+        """pending_tasksからインデックスを再構築（セッション作成・復元時）"""
+        if self.current_session:
+            self._pending_index = {
+                task.task_id: task for task in self.current_session.pending_tasks
+            }
+        else:
+            self._pending_index = {}
     
     def _ensure_directory_structure(self):
         """必要なディレクトリ構造を作成"""
@@ -119,7 +152,8 @@ class StateManager:
             last_active=datetime.now().isoformat(),
             conversation_context=[]
         )
-        
+        self._rebuild_pending_index()
+
         await self._save_session()
         await self._write_conversation_log(f"=== 新しいセッション開始: {session_id} ===")
         
@@ -128,8 +162,11 @@ class StateManager:
     async def _restore_session(self, session_id: str) -> str:
         """既存セッションを復元"""
         try:
-            with open(self.session_file, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
+            if orjson is not None:
+                session_data = orjson.loads(self.session_file.read_bytes())
+            else:
+                with open(self.session_file, 'r', encoding='utf-8') as f:
+                    session_data = json.load(f)
             
             # TaskStateオブジェクトを復元
             pending_tasks = [TaskState(**task) for task in session_data.get('pending_tasks', [])]
@@ -145,7 +182,8 @@ class StateManager:
                 pending_tasks=pending_tasks,
                 completed_tasks=completed_tasks
             )
-            
+            self._rebuild_pending_index()
+
             await self._save_session()
             await self._write_conversation_log(f"=== セッション復元: {session_id} ===")
             
@@ -159,14 +197,34 @@ class StateManager:
         """セッション状態を保存"""
         if not self.current_session:
             return
-        
-        session_dict = asdict(self.current_session)
-        session_dict['last_active'] = datetime.now().isoformat()
-        
-        with open(self.session_file, 'w', encoding='utf-8') as f:
-            json.dump(session_dict, f, ensure_ascii=False, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
+
+        # 保存＝何らかの状態変更があった印なので世代番号を進める
+        self._context_version += 1
+
+        # 書き込みはロックで直列化する。スナップショットもロック内で
+        # 取ることで「後から書く側が必ず新しい状態を持つ」ことを保証し、
+        # 古いスナップショットが新しい保存を上書きする逆転を防ぐ。
+        # さらに一時ファイル＋os.replaceにより、クラッシュや並行読み出しが
+        # あってもsession.jsonには常に完全なJSONだけが見える
+        async with self._save_lock:
+            session_dict = asdict(self.current_session)
+            session_dict['last_active'] = datetime.now().isoformat()
+            tmp_file = self.session_file.with_name(self.session_file.name + ".tmp")
+
+            def _write():
+                if orjson is not None:
+                    with open(tmp_file, 'wb') as f:
+                        f.write(orjson.dumps(session_dict, option=orjson.OPT_INDENT_2))
+                        f.flush()
+                        os.fsync(f.fileno())
+                else:
+                    with open(tmp_file, 'w', encoding='utf-8') as f:
+                        json.dump(session_dict, f, ensure_ascii=False, indent=2)
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_file, self.session_file)
+
+            await asyncio.to_thread(_write)
     
     async def add_conversation_entry(self, role: str, content: str):
         """会話エントリを追加"""
@@ -187,11 +245,14 @@ class StateManager:
         """会話ログをファイルに書き込み"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_entry = f"[{timestamp}] {message}\n"
-        
-        with open(self.conversation_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
-            f.flush()
-            os.fsync(f.fileno())
+
+        def _append():
+            with open(self.conversation_file, 'a', encoding='utf-8') as f:
+                f.write(log_entry)
+                f.flush()
+                os.fsync(f.fileno())
+
+        await asyncio.to_thread(_append)
     
     async def set_user_query(self, query: str, execution_type: str):
         """ユーザークエリと実行タイプを設定"""
@@ -208,6 +269,7 @@ class StateManager:
             await self.initialize_session()
         
         self.current_session.pending_tasks.append(task)
+        self._pending_index[task.task_id] = task
         await self._save_session()
         await self._save_task_status()
     
@@ -216,15 +278,12 @@ class StateManager:
         if not self.current_session:
             return False
         
-        # pending_tasksから該当タスクを探して削除
-        task_to_complete = None
-        for i, task in enumerate(self.current_session.pending_tasks):
-            if task.task_id == task_id:
-                task_to_complete = self.current_session.pending_tasks.pop(i)
-                break
-        
+        # インデックスから該当タスクをO(1)で取得してpending_tasksから削除
+        task_to_complete = self._pending_index.pop(task_id, None)
         if not task_to_complete:
             return False
+
+        self.current_session.pending_tasks.remove(task_to_complete)
         
         # タスクの状態を更新
         task_to_complete.status = "completed" if not error else "failed"
@@ -361,18 +420,18 @@ class StateManager:
         """現在のセッションをクリア"""
         await self.archive_session()
         
-        # ファイルを削除
+        # ファイルを削除（exists+unlinkの2システムコールを1回に）
         for file_path in [self.session_file, self.conversation_file]:
-            if file_path.exists():
-                file_path.unlink()
+            file_path.unlink(missing_ok=True)
         
         # tasksディレクトリをクリア
         for task_file in self.tasks_dir.glob("*.json"):
             task_file.unlink()
         for task_file in self.tasks_dir.glob("*.txt"):
             task_file.unlink()
-        
+
         self.current_session = None
+        self._pending_index = {}
     
     def get_session_summary(self) -> Dict[str, Any]:
         """現在のセッションの要約を取得"""
@@ -555,21 +614,28 @@ class StateManager:
         """
         import json
         from pathlib import Path
-        
+
         if export_dir is None:
             export_dir = Path.cwd() / "exports"
         else:
             export_dir = Path(export_dir)
-        
-        if not export_dir.exists():
+
+        # os.scandirは1回のディレクトリ読み取りでstat情報もまとめて返すため、
+        # exists()チェック＋glob＋個別stat()よりシステムコール数が少ない
+        try:
+            entries = list(os.scandir(export_dir))
+        except FileNotFoundError:
             return []
-        
+
         sessions = []
-        for file_path in export_dir.glob("*.json"):
+        for entry in entries:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            file_path = Path(entry.path)
             try:
-                # ファイルサイズと更新日時
-                stat = file_path.stat()
-                
+                # ファイルサイズと更新日時（scandirがキャッシュ済み）
+                stat = entry.stat()
+
                 # JSONファイルの基本情報を読み取り
                 with open(file_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
@@ -12,8 +12,11 @@ Task Executor for MCP Agent
 
 import asyncio
 import json
+import os
+import random
 import re
 import time
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Union
 
 from state_manager import TaskState, StateManager
@@ -43,8 +46,12 @@ class TaskExecutor:
     TaskManagerが管理するタスクを実際に実行し、
     ConnectionManagerを通じてツールを呼び出す
     """
-    
-    def __init__(self, 
+
+    # パラメータが前の実行結果を参照していることを示すマーカー
+    # （プロンプトが指示する "{{前の結果}}" や "前の計算結果" 等の表現）
+    PARAM_REF_MARKERS = ("{{", "前の", "結果", "取得")
+
+    def __init__(self,
                  task_manager: TaskManager,
                  connection_manager: ConnectionManager,
                  state_manager: StateManager,
@@ -79,6 +86,11 @@ class TaskExecutor:
         
         # アクティブタスク管理
         self.active_tasks = set()
+
+        # パラメータ解決結果のメモ化キャッシュ（直近128件・LRU）
+        # 同一パラメータ・同一文脈での再解決時にLLM往復を省略する
+        self._resolve_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+        self._resolve_cache_max = 128
     
     async def execute_task_sequence(self, tasks: List[TaskState], user_query: str) -> List[Dict]:
         # 実行停止フラグ
@@ -118,15 +130,23 @@ class TaskExecutor:
         
         # 現在のユーザークエリを保存
         self.current_user_query = user_query
-        
+
+        # パラメータ解決キャッシュはシーケンス内でのみ有効。
+        # 前のクエリの実行文脈で解決した結果を別クエリの同形タスクに
+        # 使い回すと誤ったツール呼び出しになるため、開始時に破棄する
+        self._resolve_cache.clear()
+
         # 新しいタスクシーケンス開始時に中断状態をリセット
         # 既存の中断状態を確認してから適切に処理
         await self.handle_interruption()
         
         for i, task in enumerate(executable_tasks):
             # 中断チェックポイント1: タスク開始前
-            interrupt_status = self.interrupt_manager.get_status()
-            self.logger.ulog(f"[STATUS] タスク{i+1}開始前: 中断状態={interrupt_status['interrupt_state']}", "debug:interrupt")  # デバッグ用
+            # デバッグログが抑制されている場合はステータスdictの構築も
+            # f-string整形も行わない（タスクごとに通る経路のため）
+            if self.logger.should_log("debug"):
+                interrupt_status = self.interrupt_manager.get_status()
+                self.logger.ulog(f"[STATUS] タスク{i+1}開始前: 中断状態={interrupt_status['interrupt_state']}", "debug:interrupt")  # デバッグ用
             
             if self.interrupt_manager.check_interrupt():
                 self.logger.ulog("[CHECK] タスク開始前に中断検知", "info:interrupt", always_print=True)
@@ -244,39 +264,27 @@ class TaskExecutor:
         tool = task.tool
         params = task.params
         description = task.description
-        
-        # 実行文脈から結果情報を抽出
-        context_info = []
-        if execution_context:
-            for i, ctx in enumerate(execution_context):
-                if ctx.get("success"):
-                    result_str = str(ctx.get("result", ""))
-                    task_desc = ctx.get("task_description", "不明なタスク")
-                    context_info.append(f"タスク{i+1}: {task_desc} → 結果: {result_str}")
-        
-        context_str = "\n".join(context_info) if context_info else "前の実行結果はありません"
-        
-        prompt = f"""次のタスクを実行するためのパラメータを、実行履歴から適切に決定してください。
-
-## 実行するタスク
-- ツール: {tool}
-- 説明: {description}
-- 元のパラメータ: {json.dumps(params, ensure_ascii=False)}
-
-## これまでの実行履歴
-{context_str}
 
-## 指示
-前の実行結果を参考にして、このタスクに最適なパラメータを決定してください。
-前のタスクの数値結果を使う場合は、その数値を直接パラメータに設定してください。
+        # 前の実行結果への参照マーカーがどこにもなければ、LLMに解決を
+        # 依頼する意味がない。C実装の部分文字列検索だけで判定して
+        # LLM往復（約1秒）を丸ごと省略する
+        scan_target = f"{repr(params)}{description}"
+        if not any(marker in scan_target for marker in self.PARAM_REF_MARKERS):
+            return params
 
-## 出力形式（JSON）
-```json
-{{
-  "resolved_params": {{実際のパラメータ値}},
-  "reasoning": "パラメータを決定した理由"
-}}
-```"""
+        # 同一シーケンス内での同一パラメータ・同一文脈の再解決はキャッシュから返す
+        # （文脈が伸びると解決結果が変わりうるためコンテキスト長をキーに含める。
+        #  キャッシュ自体はexecute_task_sequence開始時にクリアされる）
+        cache_key = (
+            tool,
+            json.dumps(params, sort_keys=True, ensure_ascii=False, default=str),
+            description,
+            len(execution_context or []),
+        )
+        cached = self._resolve_cache.get(cache_key)
+        if cached is not None:
+            self._resolve_cache.move_to_end(cache_key)
+            return dict(cached)
 
         try:
             # LLM呼び出し前の中断チェック
@@ -294,13 +302,20 @@ class TaskExecutor:
                 'description': description
             }
             
-            return await self.llm_interface.resolve_task_parameters(
+            resolved = await self.llm_interface.resolve_task_parameters(
                 task_dict=task_dict,
                 context=execution_context or [],
                 tools_info=tools_info,
                 user_query=user_query
             )
-            
+
+            if isinstance(resolved, dict):
+                self._resolve_cache[cache_key] = dict(resolved)
+                if len(self._resolve_cache) > self._resolve_cache_max:
+                    self._resolve_cache.popitem(last=False)
+
+            return resolved
+
         except Exception as e:
             self.logger.ulog(f"{e}", "error:param", show_level=True)
             return params
@@ -356,6 +371,27 @@ class TaskExecutor:
             monitor_task.cancel()
             raise
     
+    def _retry_delay(self, attempt: int, cap: float = 30.0, jitter: float = 0.5) -> float:
+        """
+        リトライ前の待機時間を計算（指数バックオフ＋ジッタ）
+
+        基準値（error_handling.retry_interval）を試行回数ごとに倍増させ、
+        同時リトライの衝突を避けるためにランダムなゆらぎを加える。
+
+        Args:
+            attempt: 何回目の試行か（0始まり）
+            cap: 待機時間の上限（秒）
+            jitter: ゆらぎの割合（0.5なら±50%）
+
+        Returns:
+            待機時間（秒）
+        """
+        base = getattr(self.config.error_handling, "retry_interval", 1.0)
+        # テスト実行時は環境変数で待機時間を短縮（CIの壁時計時間を抑える）
+        if os.environ.get("MCP_TEST_FAST_RETRY"):
+            base, cap = 0.01, 0.3
+        return min(cap, base * (2 ** attempt)) * (1 + random.uniform(-jitter, jitter))
+
     async def execute_tool_with_retry(self, tool: str, params: Dict, description: str = "") -> Any:
         """
         リトライ機能付きでツールを実行（LLM判断機能統合版）
@@ -441,7 +477,8 @@ class TaskExecutor:
                         if corrected_params != current_params:
                             self.logger.ulog(f"パラメータを修正: {safe_str(corrected_params)}", "info:correction", show_level=True)
                             current_params = corrected_params
-                        
+
+                        await asyncio.sleep(self._retry_delay(attempt))
                         continue
                     else:
                         # 成功またはリトライ不要と判断
@@ -470,7 +507,8 @@ class TaskExecutor:
                     raise Exception(raw_result)
                 
                 self.logger.ulog(f"{attempt + 1}/{max_retries}", "info:retry", show_level=True)
-                
+
+                await asyncio.sleep(self._retry_delay(attempt))
                 continue
         
         # ここには到達しないはずだが、念のため
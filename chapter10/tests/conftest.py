@@ -7,8 +7,6 @@ MCP Agent テストの共通設定とフィクスチャ
 import pytest
 import pytest_asyncio
 import asyncio
-import tempfile
-import shutil
 import os
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
@@ -17,7 +15,7 @@ from unittest.mock import AsyncMock, MagicMock
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from config_manager import Config, DisplayConfig, LLMConfig, ExecutionConfig, ConversationConfig, DevelopmentConfig
+from config_manager import Config, DisplayConfig, LLMConfig, ExecutionConfig, ConversationConfig, ErrorHandlingConfig, DevelopmentConfig
 
 from state_manager import StateManager, TaskState
 from task_manager import TaskManager
@@ -34,11 +32,13 @@ def event_loop():
 
 
 @pytest.fixture
-def temp_dir():
-    """一時ディレクトリ"""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir, ignore_errors=True)
+def temp_dir(tmp_path):
+    """一時ディレクトリ（pytestのtmp_pathに委譲）
+
+    tmp_pathはテスト失敗・例外時もpytestが確実に後始末するため、
+    手動のshutil.rmtreeは不要。
+    """
+    return str(tmp_path)
 
 
 @pytest.fixture
@@ -65,6 +65,9 @@ def mock_config():
             context_limit=10,
             max_history=50
         ),
+        error_handling=ErrorHandlingConfig(
+            retry_interval=0.01  # テストではバックオフ待機を最小化
+        ),
         development=DevelopmentConfig(
             verbose=False
         )
@@ -127,13 +130,13 @@ def sample_tasks():
 
 
 @pytest_asyncio.fixture
-async def mcp_agent_mock(temp_dir, mock_config, mock_llm_client):
-    """MCPAgentのモック"""
-    # 一時的に設定を保存
-    config_path = Path(temp_dir) / "config.yaml"
-    
-    agent = MCPAgent()
-    agent.config = mock_config
+async def mcp_agent_mock(mock_config, mock_llm_client):
+    """MCPAgentのモック
+
+    Configオブジェクトを直接渡すことで、テストごとの
+    config.yaml読み込み（ファイルI/O＋YAMLパース）を省略する。
+    """
+    agent = MCPAgent(mock_config)
     agent.llm = mock_llm_client
     
     # ConnectionManagerもモック
@@ -187,6 +190,8 @@ def setup_test_environment():
     
     # 環境変数の設定など（.env.testにない場合のデフォルト）
     os.environ.setdefault("OPENAI_API_KEY", "test_key")
+    # リトライのバックオフ待機を短縮してテストを高速化
+    os.environ.setdefault("MCP_TEST_FAST_RETRY", "1")
     yield
     # cleanup
 
@@ -213,10 +218,16 @@ async def real_llm_client(real_api_key):
         pytest.skip("openai package required for real tests")
 
 
-@pytest_asyncio.fixture
-async def real_mcp_agent(temp_dir, real_api_key):
-    """実際のMCPエージェント（モックなし）"""
-    os.environ["OPENAI_API_KEY"] = real_api_key
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def real_mcp_agent():
+    """実際のMCPエージェント（モックなし・モジュール内で共有）
+
+    initialize()はMCPサーバー接続とLLMクライアント生成を伴い数秒かかるため、
+    テストごとに作り直さずモジュール単位で1回だけ初期化して使い回す。
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key or api_key == "test_key":
+        pytest.skip("Real OPENAI_API_KEY required for this test")
     agent = MCPAgent()
     await agent.initialize()
     yield agent
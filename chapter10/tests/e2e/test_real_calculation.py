@@ -12,7 +12,7 @@ import os
 @pytest.mark.e2e
 @pytest.mark.real
 @pytest.mark.requires_api
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_real_simple_calculation(real_mcp_agent):
     """実際のMCPサーバーとLLMで単純な計算タスクを実行"""
     # 実際のエージェントで計算を実行
@@ -26,7 +26,7 @@ async def test_real_simple_calculation(real_mcp_agent):
 @pytest.mark.e2e
 @pytest.mark.real
 @pytest.mark.requires_api
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_real_chained_calculation(real_mcp_agent):
     """実際のMCPサーバーで連鎖計算を実行"""
     # 複数ステップの計算
@@ -43,7 +43,7 @@ async def test_real_chained_calculation(real_mcp_agent):
 @pytest.mark.real
 @pytest.mark.requires_api
 @pytest.mark.expensive
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_real_complex_reasoning(real_mcp_agent, skip_expensive):
     """実際のLLMで複雑な推論を含む計算を実行（高額テスト）"""
     # 複雑な文脈での計算
@@ -61,7 +61,7 @@ async def test_real_complex_reasoning(real_mcp_agent, skip_expensive):
 @pytest.mark.real
 @pytest.mark.gpt5
 @pytest.mark.expensive
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_gpt5_advanced_reasoning(real_mcp_agent, skip_expensive):
     """GPT-5の高度な推論能力をテスト（最も高額なテスト）"""
     # GPT-5モデルが設定されているか確認
@@ -14,8 +14,6 @@ REPLコマンドの包括的テスト
 import sys
 import os
 import json
-import tempfile
-import shutil
 from pathlib import Path
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 import asyncio
@@ -378,16 +376,11 @@ class TestPhase2Commands:
     """Phase 2 コマンドのテスト"""
     
     @pytest.fixture
-    def temp_export_dir(self):
-        """テンポラリエクスポートディレクトリ"""
-        temp_dir = tempfile.mkdtemp()
-        export_dir = Path(temp_dir) / ".mcp_agent" / "exports"
+    def temp_export_dir(self, tmp_path):
+        """テンポラリエクスポートディレクトリ（後始末はpytestに任せる）"""
+        export_dir = tmp_path / ".mcp_agent" / "exports"
         export_dir.mkdir(parents=True, exist_ok=True)
-        
-        yield export_dir
-        
-        # クリーンアップ
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        return export_dir
     
     @pytest.fixture
     def mock_agent_with_history(self):
@@ -730,7 +723,14 @@ async def test_command_integration():
 
 class TestPhase3Commands:
     """Phase 3: 設定管理コマンドのテスト"""
-    
+
+    @pytest.fixture(autouse=True)
+    def no_config_file_write(self, monkeypatch):
+        """/config設定変更がリポジトリの実config.yamlを書き換えないようにする"""
+        from config_manager import ConfigManager
+        monkeypatch.setattr(ConfigManager, "save_config_to_file",
+                            staticmethod(lambda *args, **kwargs: True))
+
     @pytest.fixture
     def mock_agent_with_config(self):
         """設定付きモックMCPAgentを作成"""
@@ -44,7 +44,7 @@ async def test_llm_connection(real_llm_client):
 
 @pytest.mark.smoke
 @pytest.mark.real
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_mcp_agent_initialization(real_mcp_agent):
     """MCPエージェントの初期化確認"""
     assert real_mcp_agent is not None
@@ -7,8 +7,28 @@ Utility functions for MCP Agent
 import sys
 import os
 import io
+import re
+import codecs
 from typing import Any
 
+# プラットフォーム判定とコーデック参照は起動時に1回だけ行う
+# （safe_strはログ出力のたびに呼ばれるホットパスのため）
+_IS_WINDOWS = sys.platform == "win32"
+_CP932_ENCODE = codecs.getencoder("cp932") if _IS_WINDOWS else None
+
+# サロゲート文字の検出用正規表現と'?'への置換テーブル（モジュールロード時に1回構築）
+_SURROGATE_RE = re.compile('[\ud800-\udfff]')
+_SURROGATE_TABLE = dict.fromkeys(range(0xD800, 0xE000), ord('?'))
+
+# ログレベル優先度（小文字キー）。呼び出し側は小文字でレベルを渡すため、
+# should_logのホットパスで.upper()による文字列割り当てを避けられる
+_LEVEL_PRIORITY = {
+    'debug': 10,
+    'info': 20,
+    'warning': 30,
+    'error': 40
+}
+
 
 def safe_str(obj: Any, use_repr: bool = False) -> str:
     """
@@ -24,26 +44,54 @@ def safe_str(obj: Any, use_repr: bool = False) -> str:
     text = repr(obj) if use_repr else str(obj)
     if not isinstance(text, str):
         return text
-    
+
+    # ASCIIのみならサロゲートもcp932非対応文字も含まれないため、
+    # エンコード/デコードの往復を丸ごと省略できる（C実装の一括判定）
+    if text.isascii():
+        return text
+
     # Windows環境でのcp932エンコーディング処理（高速化）
-    if sys.platform == "win32":
+    if _IS_WINDOWS:
         try:
-            # エンコード/デコードによる一括変換
-            return text.encode('cp932', errors='replace').decode('cp932')
+            # キャッシュ済みエンコーダによる一括変換
+            return _CP932_ENCODE(text, 'replace')[0].decode('cp932')
         except Exception:
             # フォールバック: 従来の文字ごと処理
             pass
     
     # サロゲート文字のみ除去（非Windows環境またはcp932処理失敗時）
-    return ''.join(
-        char if not (0xD800 <= ord(char) <= 0xDFFF) else '?'
-        for char in text
-    )
+    # まずC実装の正規表現で存在チェックし、サロゲートを含まない
+    # 大多数の文字列はエンコード往復なし・割り当てなしでそのまま返す
+    if _SURROGATE_RE.search(text) is None:
+        return text
+
+    # 事前構築したテーブルによるC実装の一括置換（Pythonループ不要）
+    return text.translate(_SURROGATE_TABLE)
+
+
+def truncate_str(text: Any, limit: int, ellipsis: str = "...") -> str:
+    """
+    文字列をlimit文字で切り詰める
+
+    超過時のみスライスと連結を行い、収まっている場合は
+    元の文字列をそのまま返す（余計な割り当てをしない）
+
+    Args:
+        text: 対象の文字列（str以外はstr()で変換）
+        limit: 最大文字数
+        ellipsis: 超過時に付加する省略記号
+
+    Returns:
+        切り詰められた文字列
+    """
+    if not isinstance(text, str):
+        text = str(text)
+    return text if len(text) <= limit else text[:limit] + ellipsis
 
 
 def setup_windows_encoding():
     """Windows環境でのUnicode対応設定"""
-    if sys.platform != "win32":
+    if not _IS_WINDOWS:
         return
     
     os.environ["PYTHONIOENCODING"] = "utf-8"
@@ -73,7 +121,41 @@ class Logger:
         'WARNING': 30,
         'ERROR': 40
     }
-    
+
+    # プレフィックス変換表（呼び出しごとにdictリテラルを再構築しない）
+    _PREFIXES = {
+        "session": "[セッション]",
+        "request": "[リクエスト]",
+        "restore": "[復元]",
+        "pause": "[セッション一時停止]",
+        "resume": "[セッション再開]",
+        "clear": "[セッションクリア]",
+        "esc": "[ESC]",
+        "interrupt": "[中断]",
+        "warning": "[警告]",
+        "error": "[エラー]",
+        "info": "[情報]",
+        "retry": "[リトライ]",
+        "config": "[設定]",
+        "instruction": "[指示書]",
+        "connection": "[接続管理]",
+        "init": "[初期化]",
+        "collection": "[収集]",
+        "correction": "[修正]",
+        "success": "[成功]",
+        "classification": "[分類]",
+        "completed": "[完了]",
+        "failed": "[失敗]",
+        "param": "[パラメータ]",
+        "analysis": "[分析]",
+        "llm_response": "[LLM生レスポンス]",
+        "llm_error": "[LLM判断エラー]",
+        "llm_judgment": "[LLM判断]",
+        "llm_reason": "[LLM理由]",
+        "llm_correction": "[LLM修正案]",
+    }
+
+
     def __init__(self, verbose: bool = True, log_level: str = "INFO"):
         """
         Args:
@@ -86,8 +168,10 @@ class Logger:
     
     def should_log(self, level: str) -> bool:
         """指定レベルのログを出力すべきか判定"""
-        level = level.upper()
-        priority = self.LEVEL_PRIORITY.get(level, 20)
+        # 通常は小文字で渡されるためそのまま引き、外れた場合のみ正規化する
+        priority = _LEVEL_PRIORITY.get(level)
+        if priority is None:
+            priority = _LEVEL_PRIORITY.get(level.lower(), 20)
         return priority >= self.min_priority
     
     def ulog(self, message: str, level: str = "info", always_print: bool = False, show_level: bool = False) -> None:
@@ -101,59 +185,32 @@ class Logger:
             always_print: Trueの場合、verbose設定に関わらず表示
             show_level: Trueの場合、ログレベルプレフィックスも表示（例: [INFO] [分析]）
         """
+        # 出力されないログはレベル分解前に打ち切る
+        # （verboseオフ時のホットパスではsplitもdict参照も行わない）
+        if not (self.verbose or always_print):
+            return
+
         # ログレベルとプレフィックスの分離
         parts = level.split(':', 1)
         log_level = parts[0]
         prefix_key = parts[1] if len(parts) > 1 else None
-        
+
         # ログレベル判定（always_printの場合は無視）
         if not self.should_log(log_level) and not always_print:
             return
-            
+
         # コンソール出力
-        if self.verbose or always_print:
-            if prefix_key:
-                prefixes = {
-                    "session": "[セッション]",
-                    "request": "[リクエスト]", 
-                    "restore": "[復元]",
-                    "pause": "[セッション一時停止]",
-                    "resume": "[セッション再開]",
-                    "clear": "[セッションクリア]",
-                    "esc": "[ESC]",
-                    "interrupt": "[中断]",
-                    "warning": "[警告]",
-                    "error": "[エラー]",
-                    "info": "[情報]",
-                    "retry": "[リトライ]",
-                    "config": "[設定]",
-                    "instruction": "[指示書]",
-                    "connection": "[接続管理]",
-                    "init": "[初期化]",
-                    "collection": "[収集]",
-                    "correction": "[修正]",
-                    "success": "[成功]",
-                    "classification": "[分類]",
-                    "completed": "[完了]",
-                    "failed": "[失敗]",
-                    "param": "[パラメータ]",
-                    "analysis": "[分析]",
-                    "llm_response": "[LLM生レスポンス]",
-                    "llm_error": "[LLM判断エラー]",
-                    "llm_judgment": "[LLM判断]",
-                    "llm_reason": "[LLM理由]",
-                    "llm_correction": "[LLM修正案]",
-                }
-                prefix = prefixes.get(prefix_key, f"[{prefix_key.upper()}]")
-                if show_level:
-                    level_prefix = f"[{log_level.upper()}]"
-                    print(f"{level_prefix} {prefix} {message}")
-                else:
-                    print(f"{prefix} {message}")
+        if prefix_key:
+            prefix = self._PREFIXES.get(prefix_key, f"[{prefix_key.upper()}]")
+            if show_level:
+                level_prefix = f"[{log_level.upper()}]"
+                print(f"{level_prefix} {prefix} {message}")
+            else:
+                print(f"{prefix} {message}")
+        else:
+            if show_level:
+                level_prefix = f"[{log_level.upper()}]"
+                print(f"{level_prefix} {message}")
             else:
-                if show_level:
-                    level_prefix = f"[{log_level.upper()}]"
-                    print(f"{level_prefix} {message}")
-                else:
-                    print(message)
+                print(message)
     